@@ -1,6 +1,14 @@
+import logging
+import os
+import sys
 from src.harvester import generate_xml
 
 def main():
+  logging.basicConfig(
+    level=os.getenv("HARVEST_LOG_LEVEL", "INFO").upper(),
+    format="%(message)s",
+    stream=sys.stdout
+  )
   generate_xml()
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+# cython: language_level=3
+"""
+Compiled helpers for xml_builder (optional).
+
+Build in place with:
+
+  cythonize -i src/_xml_fast.pyx
+
+xml_builder uses these when the extension is importable and falls back
+to its pure-Python versions otherwise; both behave identically.
+"""
+
+cdef object _MISSING = object()
+
+cpdef object walk(object record, tuple steps, object default=None):
+  """
+  Compiled xml_builder._walk: follow compiled source steps through a record.
+  """
+  cdef object value = record
+  cdef object step
+
+  for step in steps:
+    if type(step) is int:
+      if type(value) is list:
+        if step < len(<list>value):
+          value = (<list>value)[step]
+          continue
+        return default
+      step = str(step)
+
+    if type(value) is not dict:
+      return default
+    value = (<dict>value).get(step, _MISSING)
+    if value is _MISSING:
+      return default
+
+  return value
@@ -1,12 +1,272 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import ijson
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3.exceptions
+from urllib3.util.retry import Retry
+from .config import HARVEST_CACHE_FILE, HARVEST_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Shared session: keeps connections alive across calls and retries
+# transient gateway errors instead of failing the whole harvest.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+  pool_connections=4,
+  pool_maxsize=8,
+  max_retries=Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[502, 503, 504]
+  )
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+def _load_cache():
+  """
+  Load the conditional GET cache index.
+
+  Layout:
+    { url: { "etag": str, "last_modified": str } }
+
+  The response body of each URL is stored separately under
+  HARVEST_CACHE_DIR (see _body_path). A missing or unreadable
+  index is treated as empty.
+  """
+  try:
+    with open(HARVEST_CACHE_FILE, "r", encoding="utf-8") as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return {}
+
+def _write_atomic(path, data):
+  """
+  Write bytes to path through a temporary file in the same directory,
+  replaced into place: readers see the old or the new file, never a
+  partial one.
+  """
+  fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+  try:
+    with os.fdopen(fd, "wb") as f:
+      f.write(data)
+    os.replace(tmp, path)
+  except BaseException:
+    try:
+      os.unlink(tmp)
+    except OSError:
+      pass
+    raise
+
+def _save_cache(cache):
+  """
+  Persist the conditional GET cache index. Failures are not fatal.
+  """
+  try:
+    _write_atomic(HARVEST_CACHE_FILE, json.dumps(cache).encode("utf-8"))
+  except OSError as e:
+    logger.warning("Could not write harvest cache: %s", e)
+
+def _forget(cache, api_url):
+  """
+  Drop the cache entry of api_url, e.g. when its body is gone.
+  """
+  if cache.pop(api_url, None) is not None:
+    _save_cache(cache)
+
+def _body_path(api_url):
+  return HARVEST_CACHE_DIR / f"{hashlib.sha1(api_url.encode()).hexdigest()}.json"
+
+def _conditional_headers(cache, api_url):
+  """
+  Build If-None-Match / If-Modified-Since headers for api_url.
+
+  Only sent when the cached body is still on disk, otherwise a 304
+  would leave nothing to return.
+  """
+  cached = cache.get(api_url)
+  if not cached or not _body_path(api_url).exists():
+    return {}
+
+  headers = {}
+  if cached.get("etag"):
+    headers["If-None-Match"] = cached["etag"]
+  if cached.get("last_modified"):
+    headers["If-Modified-Since"] = cached["last_modified"]
+  return headers
+
+def _remember(cache, api_url, response):
+  """
+  Record the validators of a 200 response.
+
+  Returns True if the response is cacheable (has a validator).
+  """
+  etag = response.headers.get("ETag")
+  last_modified = response.headers.get("Last-Modified")
+  if not (etag or last_modified):
+    return False
+
+  cache[api_url] = {
+    "etag": etag,
+    "last_modified": last_modified
+  }
+  return True
+
+class _TeeReader:
+  """
+  File-like wrapper that copies everything read from `raw` into `sink`.
+
+  Lets the streamed response body be cached while ijson consumes it.
+  """
+  def __init__(self, raw, sink):
+    self.raw = raw
+    self.sink = sink
+
+  def read(self, size=-1):
+    chunk = self.raw.read(size)
+    self.sink.write(chunk)
+    return chunk
 
 def fetch_json(api_url):
+  """
+  Fetch and decode the JSON payload at api_url.
+
+  Sends If-None-Match / If-Modified-Since when a previous response
+  for the same URL is cached; on 304 the cached body is decoded
+  instead of re-downloading it. If that body is missing or
+  unreadable, its cache entry is dropped and the payload is fetched
+  again without validators.
+
+  Decoding uses orjson, which returns the same dict/list/str types
+  as the standard json module, considerably faster on large payloads.
+  """
+  cache = _load_cache()
+  body_path = _body_path(api_url)
+
   try:
-    response = requests.get(api_url, timeout=30)
+    response = _SESSION.get(
+      api_url,
+      headers=_conditional_headers(cache, api_url),
+      timeout=30
+    )
+    if response.status_code == 304:
+      try:
+        return orjson.loads(body_path.read_bytes())
+      except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning("Cached harvest body unusable, refetching: %s", e)
+        _forget(cache, api_url)
+        response = _SESSION.get(api_url, timeout=30)
     response.raise_for_status()
-    return response.json()
+    data = orjson.loads(response.content)
+  except requests.exceptions.RequestException as e:
+    raise RuntimeError(
+      f"Failed to connect to API endpoint.\n"
+      f"Reason: {str(e)}"
+    )
+  except orjson.JSONDecodeError as e:
+    raise RuntimeError(
+      f"API endpoint returned invalid JSON.\n"
+      f"Reason: {str(e)}"
+    )
+
+  if _remember(cache, api_url, response):
+    try:
+      HARVEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+      _write_atomic(body_path, response.content)
+      _save_cache(cache)
+    except OSError as e:
+      logger.warning("Could not write harvest cache: %s", e)
+
+  return data
+
+def _stream_items(response, cache, api_url, body_path):
+  """
+  Decode the "data" items of a successful streamed response.
+
+  On 304 the cached body is read from disk instead; a cacheable 200
+  response is copied to disk while it is being decoded.
+  """
+  if response.status_code == 304:
+    with open(body_path, "rb") as f:
+      yield from ijson.items(f, "data.item", use_float=True)
+    return
+
+  response.raw.decode_content = True
+
+  if not _remember(cache, api_url, response):
+    yield from ijson.items(response.raw, "data.item", use_float=True)
+    return
+
+  HARVEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+  partial = body_path.with_suffix(".part")
+  with open(partial, "wb") as sink:
+    yield from ijson.items(
+      _TeeReader(response.raw, sink), "data.item", use_float=True
+    )
+
+  # Only publish the body once it has been fully read
+  partial.replace(body_path)
+  _save_cache(cache)
+
+def iter_records(api_url):
+  """
+  Stream the records of the harvest payload at api_url.
+
+  Yields each item of the top-level "data" array as soon as it is
+  decoded, so the full payload is never held in memory.
+
+  The conditional GET cache is shared with fetch_json: on 304 the
+  cached body is streamed from disk, and a cacheable 200 response is
+  copied to disk while it is being decoded.
+
+  As in fetch_json, connection, transfer and decoding failures
+  (including those after the first record) are raised as RuntimeError.
+  """
+  cache = _load_cache()
+  body_path = _body_path(api_url)
+
+  try:
+    response = _SESSION.get(
+      api_url,
+      headers=_conditional_headers(cache, api_url),
+      stream=True,
+      timeout=30
+    )
   except requests.exceptions.RequestException as e:
     raise RuntimeError(
       f"Failed to connect to API endpoint.\n"
       f"Reason: {str(e)}"
     )
+
+  with response:
+    try:
+      response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+      raise RuntimeError(
+        f"Failed to connect to API endpoint.\n"
+        f"Reason: {str(e)}"
+      )
+
+    if response.status_code == 304 and not body_path.is_file():
+      # Cached body gone: forget it and fetch the payload in full
+      _forget(cache, api_url)
+      yield from iter_records(api_url)
+      return
+
+    try:
+      yield from _stream_items(response, cache, api_url, body_path)
+    except ijson.JSONError as e:
+      raise RuntimeError(
+        f"API endpoint returned invalid JSON.\n"
+        f"Reason: {str(e)}"
+      )
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+      raise RuntimeError(
+        f"Failed to read API response.\n"
+        f"Reason: {str(e)}"
+      )
@@ -24,9 +24,18 @@ At runtime, this registry allows the builder to:
 Design
 ------
 
-The registry is constructed once at import time and stored in:
+The registry is constructed lazily, on first use, and returned by:
 
-  CODELIST_REGISTRY
+  get_registry()
+
+It is also reachable as the module attribute CODELIST_REGISTRY, which
+triggers the same lazy load. Importing this module therefore does not
+parse the register.
+
+The built registry is pickled next to the register file
+(.napMetadataRegister.cache.pkl) together with the XML file's
+mtime and size and CODELIST_CACHE_VERSION. Later imports load the
+pickle while both are unchanged, and rebuild it otherwise.
 
 Dependencies
 ------------
@@ -36,6 +45,11 @@ napMetadataRegister.xml stored under: src/codelists/
 Public API
 ----------
 
+get_registry()
+
+Returns:
+  The IC_xxx -> { display_name -> RI_xxx } registry.
+
 resolve_codelist_value(codeList_url, display_text)
 
 Returns:
@@ -43,7 +57,14 @@ Returns:
 """
 
 from lxml import etree
+from functools import lru_cache
+import logging
 import os
+import pickle
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
 
 CODELIST_FILE = os.path.join(
   os.path.dirname(__file__),
@@ -51,25 +72,58 @@ CODELIST_FILE = os.path.join(
   "napMetadataRegister.xml"
 )
 
+CODELIST_CACHE_FILE = os.path.join(
+  os.path.dirname(__file__),
+  "codelists",
+  ".napMetadataRegister.cache.pkl"
+)
+
+# Bump whenever _load_codelists changes what it builds, so pickles
+# written by an older version are rebuilt instead of reused.
+CODELIST_CACHE_VERSION = 1
+
 NS = {
     "grg": "http://www.isotc211.org/2005/grg",
     "gco": "http://www.isotc211.org/2005/gco",
     "xlink": "http://www.w3.org/1999/xlink"
 }
 
+# Precompiled QNames used by the streaming parser
+_RE_REGISTER_ITEM = f"{{{NS['grg']}}}RE_RegisterItem"
+_RE_ITEM_CLASS = f"{{{NS['grg']}}}RE_ItemClass"
+
+# Compiled once and applied to every streamed element.
+# The register schema is shallow: names and describedItem
+# references are direct children, so the child axis suffices.
+_NAME_XP = etree.XPath(
+  "./grg:name/gco:CharacterString/text()",
+  namespaces=NS
+)
+_DESC_XP = etree.XPath(
+  "./grg:describedItem/@xlink:href",
+  namespaces=NS
+)
+
 def _load_codelists():
   """
   Parse napMetadataRegister.xml and build a registry dictionary.
 
   Process:
-  1. Extract all RE_RegisterItem entries to build an RI lookup:
+  1. Stream the register with iterparse, only stopping on
+    RE_RegisterItem and RE_ItemClass elements.
+
+  2. For each RE_RegisterItem, record (via _NAME_XP):
     RI_id -> display_name
 
-  2. Extract all RE_ItemClass entries (IC_xxx).
-  For each IC:
-    - Find describedItem references
-    - Resolve xlink:href -> RI_id
-    - Map display_name -> RI_id
+  3. For each RE_ItemClass (IC_xxx), collect its describedItem
+    xlink:href references (RI_id) via _DESC_XP.
+
+  4. Once the stream is exhausted, map display_name -> RI_id
+    for every IC. Item classes appear before register items in
+    the file, so href resolution is deferred to the end.
+
+  Processed elements are cleared as the stream advances to keep
+  memory flat.
 
   Returns:
     dict:
@@ -81,57 +135,53 @@ def _load_codelists():
         ...
       }
 
-  This function is executed once at import time.
+  This function is executed at most once per process, on first
+  use of the registry (see get_registry), and only when the pickle
+  cache is stale.
   """
 
-  tree = etree.parse(CODELIST_FILE)
-  root = tree.getroot()
-
-  registry = {}
-
   # Temporary lookup for RI identifiers -> display names
   ri_lookup = {}
 
-  # Extract all individual register items (RI_xxx definitions)
-  register_items = root.xpath(
-    ".//grg:RE_RegisterItem",
-    namespaces=NS
+  # IC identifiers -> referenced RI identifiers (resolved at the end)
+  ic_refs = {}
+
+  # No xml:id index and no whitespace-only text nodes: neither is
+  # used here, and both cost parse time and memory.
+  context = etree.iterparse(
+    CODELIST_FILE,
+    events=("end",),
+    tag=(_RE_REGISTER_ITEM, _RE_ITEM_CLASS),
+    collect_ids=False,
+    remove_blank_text=True,
+    huge_tree=True
   )
 
-  for item in register_items:
-    ri_id = item.get("id")
-
-    name_node = item.xpath(
-      ".//grg:name/gco:CharacterString",
-      namespaces=NS
-    )
-
-    if ri_id and name_node:
-      name = name_node[0].text.strip()
-      ri_lookup[ri_id] = name
+  for _, elem in context:
+    if elem.tag == _RE_REGISTER_ITEM:
+      ri_id = elem.get("id")
+      texts = _NAME_XP(elem)
 
-  # Now build IC mapping
-  item_classes = root.xpath(
-    ".//grg:RE_ItemClass",
-    namespaces=NS
-  )
-
-  for ic in item_classes:
-    ic_id = ic.get("id")
-    value_map = {}
+      if ri_id and texts:
+        ri_lookup[sys.intern(ri_id)] = sys.intern(str(texts[0]).strip())
 
-    described = ic.xpath(
-      ".//grg:describedItem",
-      namespaces=NS
-    )
+    else:
+      ic_refs[sys.intern(elem.get("id"))] = [
+        sys.intern(href.replace("#", "")) for href in _DESC_XP(elem) if href
+      ]
 
-    for d in described:
-      href = d.get("{http://www.w3.org/1999/xlink}href")
-      if not href:
-        continue
+    # Free processed elements
+    elem.clear()
+    while elem.getprevious() is not None:
+      del elem.getparent()[0]
 
-      ri_id = href.replace("#", "")
+  del context
 
+  # Now build IC mapping
+  registry = {}
+  for ic_id, ri_ids in ic_refs.items():
+    value_map = {}
+    for ri_id in ri_ids:
       name = ri_lookup.get(ri_id)
       if name:
         value_map[name] = ri_id
@@ -140,13 +190,77 @@ def _load_codelists():
 
   return registry
 
-CODELIST_REGISTRY = _load_codelists()
-# print(CODELIST_REGISTRY.get("IC_90"))
-# print(CODELIST_REGISTRY.get("IC_106"))
-# print(CODELIST_REGISTRY.get("IC_102"))
-# print(CODELIST_REGISTRY.get("IC_96"))
-# print(CODELIST_REGISTRY.get("IC_109"))
+def _intern_registry(registry):
+  """
+  Intern every IC id, display name and RI id of a registry.
+
+  The registry lives for the whole process and its strings repeat
+  across ICs; interned strings are shared and compare by identity
+  first on dictionary lookups. Unpickling does not preserve
+  interning, so this also runs on a registry loaded from cache.
+  """
+  return {
+    sys.intern(ic_id): {
+      sys.intern(name): sys.intern(ri_id)
+      for name, ri_id in value_map.items()
+    }
+    for ic_id, value_map in registry.items()
+  }
+
+def _load_registry():
+  """
+  Return the codelist registry, using the pickle cache when fresh.
 
+  The cache stores (key, registry) where key is
+  (CODELIST_CACHE_VERSION, st_mtime_ns, st_size) of the register
+  file. A stale, missing, or unreadable cache
+  triggers a rebuild via _load_codelists(), and the cache is rewritten.
+  Failing to write the cache is not fatal.
+  """
+  st = os.stat(CODELIST_FILE)
+  key = (CODELIST_CACHE_VERSION, st.st_mtime_ns, st.st_size)
+
+  try:
+    with open(CODELIST_CACHE_FILE, "rb") as f:
+      cached_key, registry = pickle.load(f)
+    if cached_key == key:
+      return _intern_registry(registry)
+  except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+    pass
+
+  registry = _load_codelists()
+
+  try:
+    with open(CODELIST_CACHE_FILE, "wb") as f:
+      pickle.dump((key, registry), f, protocol=5)
+  except OSError as e:
+    logger.warning("Could not write codelist cache: %s", e)
+
+  return registry
+
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+def get_registry():
+  """
+  Return the codelist registry, loading it on first call.
+
+  Thread-safe: concurrent first calls load the registry only once.
+  """
+  global _REGISTRY
+  if _REGISTRY is None:
+    with _REGISTRY_LOCK:
+      if _REGISTRY is None:
+        _REGISTRY = _load_registry()
+  return _REGISTRY
+
+def __getattr__(name):
+  # Lazy module attribute: CODELIST_REGISTRY
+  if name == "CODELIST_REGISTRY":
+    return get_registry()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@lru_cache(maxsize=4096)
 def resolve_codelist_value(codeList_url, display_text):
   """
   Resolve ISO codeList display text to its RI identifier.
@@ -171,7 +285,13 @@ def resolve_codelist_value(codeList_url, display_text):
 
   Notes
   -----
+  - Controlled mapping fields are normally resolved through the
+    precomputed vocab_index.CONTROLLED_INDEX; this function is the
+    fallback for values outside the vocabulary.
   - Only the first portion before ';' is used for matching.
+  - Results are memoized per (codeList_url, display_text). If
+    the registry is replaced (e.g. in tests), call
+    resolve_codelist_value.cache_clear().
   - Returns None if:
     - codeList_url malformed
     - IC not found
@@ -180,16 +300,15 @@ def resolve_codelist_value(codeList_url, display_text):
   if not display_text or not codeList_url:
     return None
 
-  # Extract IC_XXX
-  if "#" not in codeList_url:
+  # Extract IC_XXX (partition/rpartition: no intermediate list)
+  _, sep, ic_id = codeList_url.rpartition("#")
+  if not sep:
     return None
 
-  ic_id = codeList_url.split("#")[-1]
-
   # Extract first part before ;
-  name = display_text.split(";")[0].strip()
+  name = display_text.partition(";")[0].strip()
 
-  value_map = CODELIST_REGISTRY.get(ic_id)
+  value_map = get_registry().get(ic_id)
   if not value_map:
     return None
 
@@ -22,4 +22,11 @@ API_URL = API_ENDPOINTS[ENV]
 # Path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 OUTPUT_DIR = PROJECT_ROOT / "output"
-OUTPUT_DIR.mkdir(exist_ok=True)
+
+# Conditional GET cache (ETag / Last-Modified) for the harvest endpoint
+HARVEST_CACHE_FILE = OUTPUT_DIR / ".harvest_cache.json"
+HARVEST_CACHE_DIR = OUTPUT_DIR / ".harvest_cache"
+
+# Optional: pack all generated XML into OUTPUT_DIR/<name> (.tar.gz)
+# instead of writing one file per record
+OUTPUT_ARCHIVE = os.getenv("HARVEST_ARCHIVE")
@@ -17,8 +17,13 @@ codeList identifiers (e.g., RI_XXX) during XML generation.
 
 This file contains only vocabulary configuration.
 Normalization logic is handled in normalization.py.
+
+Each field's vocabulary is exposed as a read-only MappingProxyType:
+vocabularies are configuration and must not be modified at runtime.
 """
 
+from types import MappingProxyType
+
 CONTROLLED_VOCAB = {
   "language": {
     "EN": "eng; CAN",
@@ -71,11 +76,9 @@ CONTROLLED_VOCAB = {
 
     # 
     "point of contact": "pointOfContact; contact",
-    "Principal Investigator": "principalInvestigator; chercheurPrincipal",
     # "PSSI Distributor": "distributor; distributeur",
 
     "contact": "pointOfContact; contact",
-    "Chercheur Principal": "principalInvestigator; chercheurPrincipal",
   },
 
   # IC_106
@@ -243,3 +246,7 @@ CONTROLLED_VOCAB = {
     "Vidéo": "video; video",
   }
 }
+
+for _field, _values in CONTROLLED_VOCAB.items():
+  CONTROLLED_VOCAB[_field] = MappingProxyType(_values)
+del _field, _values
@@ -1,31 +1,122 @@
+import io
+import logging
+import os
+import tarfile
+import time
 import uuid
-from .api_client import fetch_json
-from .xml_builder import build_xml
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .api_client import iter_records
+from .xml_builder import build_xml_to_bytes, start_template_preload
 from .mapping import FIELD_MAPPING
-from .config import API_URL, OUTPUT_DIR
+from .config import API_URL, OUTPUT_DIR, OUTPUT_ARCHIVE
+
+# Records are independent: building and writing them in threads overlaps
+# lxml's C work (which releases the GIL) with file I/O.
+MAX_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+# Records in flight at once; bounds memory while records are streamed
+MAX_PENDING = MAX_WORKERS * 2
+
+# Progress is reported every PROGRESS_EVERY records; per-file messages
+# are logged at DEBUG level only.
+PROGRESS_EVERY = 256
+
+logger = logging.getLogger(__name__)
 
 def extract_record_id(record):
   return record.get("files", [{}])[0].get("id", str(uuid.uuid4()))
 
+def _serialize(record):
+  """
+  Build the XML for one record and serialize it in a single call.
+
+  Returns (record_id, bytes).
+  """
+  record_id = extract_record_id(record)
+  data = build_xml_to_bytes(
+    record=record,
+    record_id=record_id,
+    mapping=FIELD_MAPPING,
+  )
+  return record_id, data
+
+def _write_file(filename, data):
+  """
+  Write bytes with raw os calls (no Python-level file buffering).
+  """
+  fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+  try:
+    view = memoryview(data)
+    while view:
+      view = view[os.write(fd, view):]
+  finally:
+    os.close(fd)
+
+def _emit(record):
+  record_id, data = _serialize(record)
+  filename = OUTPUT_DIR / f"{record_id}.xml"
+  _write_file(filename, data)
+  logger.debug("Saved %s", filename)
+
+def _add_to_archive(archive, record_id, data):
+  info = tarfile.TarInfo(f"{record_id}.xml")
+  info.size = len(data)
+  info.mtime = int(time.time())
+  archive.addfile(info, io.BytesIO(data))
+  logger.debug("Archived %s.xml", record_id)
+
 def generate_xml():
-  raw = fetch_json(API_URL)
-  records = raw.get("data", [])
-
-  print(f"Found {len(records)} records. \n")
-
-  for record in records:
-    record_id = extract_record_id(record)
-    xml_tree = build_xml(
-      record=record,
-      record_id=record_id,
-      mapping=FIELD_MAPPING,
-    )
-    filename = f"{OUTPUT_DIR}/{record_id}.xml"
-    xml_tree.write(
-      filename, 
-      pretty_print=True,
-      xml_declaration=True,
-      encoding="UTF-8"
-    )
-    print(f"Saved {filename} \n")
+  """
+  Harvest all records from API_URL and write one XML file per record.
+
+  Relies on xml_builder parsing each base template once and handing
+  out deep copies: records are built concurrently, and each worker
+  must get its own tree.
+
+  When OUTPUT_ARCHIVE is set, workers only build and serialize; the
+  results are appended sequentially to a single .tar.gz stream instead
+  of thousands of individual files (much cheaper on network shares).
+  """
+  OUTPUT_DIR.mkdir(exist_ok=True)
+
+  # Parse the base templates while the first records are fetched
+  start_template_preload()
+
+  count = 0
+  completed = 0
+  pending = set()
+  archive = None
+
+  if OUTPUT_ARCHIVE:
+    archive = tarfile.open(str(OUTPUT_DIR / OUTPUT_ARCHIVE), mode="w|gz")
+    task = _serialize
+  else:
+    task = _emit
+
+  def collect(futures):
+    nonlocal completed
+    for future in futures:
+      result = future.result()
+      if archive is not None:
+        _add_to_archive(archive, *result)
+
+      completed += 1
+      if completed % PROGRESS_EVERY == 0:
+        logger.info("Saved %d records...", completed)
+
+  try:
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+      for record in iter_records(API_URL):
+        if len(pending) >= MAX_PENDING:
+          done, pending = wait(pending, return_when=FIRST_COMPLETED)
+          collect(done)
+
+        pending.add(executor.submit(task, record))
+        count += 1
+
+      collect(pending)
+  finally:
+    if archive is not None:
+      archive.close()
 
+  logger.info("Processed %d records.", count)
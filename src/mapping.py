@@ -32,6 +32,13 @@ controlled:
   - The raw source value is mapped to a controlled vocabulary value.
   - Used for ISO codeList-compliant fields.
 
+ic:
+  Optional codeList class (IC_xxx) of the target element.
+  - Only meaningful together with `controlled`.
+  - Must match the IC referenced by the template node's codeList URL.
+  - Used to precompute the RI identifier of every vocabulary value
+    (see vocab_index.py).
+
 Repeat Configuration
 --------------------
 
@@ -99,7 +106,8 @@ FIELD_MAPPING = [
   {
     "xpath": ".//gmd:characterSet/gco:MD_CharacterSetCode",
     "source": "edhProfile.characterSet",
-    "controlled": "characterSet"
+    "controlled": "characterSet",
+    "ic": "IC_95"
   },
   # hierarchyLevel
   # {
@@ -123,7 +131,8 @@ FIELD_MAPPING = [
   {
     "xpath": ".//gmd:contact/gmd:CI_ResponsibleParty/gmd:role/gmd:CI_RoleCode",
     "source": "edhProfile.contactRole",
-    "controlled": "role"
+    "controlled": "role",
+    "ic": "IC_90"
   },
 
 
@@ -153,7 +162,8 @@ FIELD_MAPPING = [
   {
     "xpath": ".//gmd:identificationInfo/gmd:MD_DataIdentification/gmd:status/gmd:MD_ProgressCode",
     "source": "edhProfile.datasetStatus",
-    "controlled": "status"
+    "controlled": "status",
+    "ic": "IC_106"
   },
   # data_identification_language
   {
@@ -175,7 +185,8 @@ FIELD_MAPPING = [
     "xpath": ".//gmd:identificationInfo/gmd:MD_DataIdentification/gmd:resourceMaintenance/gmd:MD_MaintenanceInformation/gmd:maintenanceAndUpdateFrequency/gmd:MD_MaintenanceFrequencyCode",
     "source": "updateFrequency",
     "source_fr": "updateFrequencyFr",
-    "controlled": "updateFrequency"
+    "controlled": "updateFrequency",
+    "ic": "IC_102"
   },
 
 
@@ -191,7 +202,8 @@ FIELD_MAPPING = [
   {
     "xpath": ".//gmd:identificationInfo/gmd:MD_DataIdentification/gmd:citation/gmd:CI_Citation/gmd:citedResponsibleParty/gmd:CI_ResponsibleParty/gmd:role/gmd:CI_RoleCode",
     "source": "edhProfile.citedResponsiblePartyRole",
-    "controlled": "role"
+    "controlled": "role",
+    "ic": "IC_90"
   },
 
 
@@ -228,7 +240,8 @@ FIELD_MAPPING = [
     "xpath": ".//gmd:identificationInfo/gmd:MD_DataIdentification/gmd:resourceConstraints/gmd:MD_SecurityConstraints/gmd:classification/gmd:MD_ClassificationCode",
     "source": "classification",
     "source_fr": "classificationFr",
-    "controlled": "classification"
+    "controlled": "classification",
+    "ic": "IC_96"
   },
 
 
@@ -253,7 +266,8 @@ FIELD_MAPPING = [
   {
     "xpath": ".//gmd:identificationInfo/gmd:MD_DataIdentification/gmd:spatialRepresentationType/gmd:MD_SpatialRepresentationTypeCode",
     "source": "spatialType",
-    "controlled": "spatialType"
+    "controlled": "spatialType",
+    "ic": "IC_109"
   },
 
 
@@ -284,6 +298,7 @@ FIELD_MAPPING = [
   {
     "xpath": ".//gmd:distributionInfo/gmd:MD_Distribution/gmd:distributor/gmd:MD_Distributor/gmd:distributorContact/gmd:CI_ResponsibleParty/gmd:role/gmd:CI_RoleCode",
     "source": "edhProfile.distributionContactRole",
-    "controlled": "role"
+    "controlled": "role",
+    "ic": "IC_90"
   },
 ]
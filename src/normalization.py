@@ -10,7 +10,7 @@ Source data may contain inconsistent casing, spacing, or formatting.
 This module standardizes input values before they are inserted into XML.
 
 It performs:
-  - Case-insensitive matching
+  - Case-insensitive matching (str.casefold)
   - Whitespace trimming
   - Safe fallback to original value if not found
 
@@ -18,7 +18,8 @@ Design
 ------
 
 1. CONTROLLED_VOCAB is imported from controlled_vocab.py
-2. Keys are pre-normalized once at import time
+2. Keys are pre-normalized once at import time, and flattened into
+   NORMALIZED_VOCAB_FLAT for a single (field, key) probe per value
 3. normalize_controlled_value() is called by the XML builder
    when a mapping field is marked as "controlled"
 
@@ -30,17 +31,36 @@ If a value is not found in the vocabulary:
   -> XML generation continues (no hard failure)
 """
 
+import sys
 from .controlled_vocab import CONTROLLED_VOCAB
 
+# Types whose falsy values count as "empty" (None, "", []). Tested as
+# `not value and type(value) in EMPTY_TYPES`: non-empty values exit on
+# the first truth test, with no per-call tuple of sentinels to build.
+EMPTY_TYPES = frozenset((type(None), str, list))
+
+def normalize_key(value):
+  """
+  Fold a raw value into its vocabulary lookup key.
+
+  Strips surrounding whitespace and case-folds, so that e.g.
+  " Point of Contact" and "point of contact" share one key.
+  """
+  return str(value).strip().casefold()
+
 def _normalize_vocab(vocab):
   """
   Preprocess the CONTROLLED_VOCAB dictionary.
 
-  Converts all vocabulary keys to:
-    - lowercase
+  Converts all vocabulary keys with normalize_key():
+    - case-folded
     - stripped of surrounding whitespace
 
-  This enables case-insensitive matching during normalization.
+  Keys and string values are interned: the same display texts repeat
+  across many keys and are later compared against registry strings.
+
+  This enables case-insensitive matching during normalization, with a
+  single dictionary probe per value.
 
   Parameters
   ----------
@@ -51,18 +71,44 @@ def _normalize_vocab(vocab):
   -------
   dict
     A normalized vocabulary dictionary.
+
+  Raises
+  ------
+  ValueError
+    If two keys of the same field fold to the same key but map to
+    different values (one of them would be silently lost).
   """
   normalized = {}
   for field, mapping in vocab.items():
-    normalized[field] = {
-      str(k).strip().lower(): v
-      for k, v in mapping.items()
-    }
+    folded = {}
+    for k, v in mapping.items():
+      key = sys.intern(normalize_key(k))
+      if isinstance(v, str):
+        v = sys.intern(v)
+      if key in folded and folded[key] != v:
+        raise ValueError(
+          f"Conflicting CONTROLLED_VOCAB entries for {field!r}: "
+          f"{key!r} -> {folded[key]!r} / {v!r}"
+        )
+      folded[key] = v
+    normalized[field] = folded
   return normalized
 
 # Preprocess vocab once
 NORMALIZED_VOCAB = _normalize_vocab(CONTROLLED_VOCAB)
 
+# Single-level view of NORMALIZED_VOCAB: (field, key) -> value
+NORMALIZED_VOCAB_FLAT = {
+  (field, key): value
+  for field, values in NORMALIZED_VOCAB.items()
+  for key, value in values.items()
+}
+
+# Fields with at least one vocabulary entry (O(1) early-out)
+_FIELDS_WITH_VOCAB = frozenset(
+  field for field, values in NORMALIZED_VOCAB.items() if values
+)
+
 def normalize_controlled_value(field, raw_value):
   """
   Normalize a controlled vocabulary value.
@@ -90,30 +136,26 @@ def normalize_controlled_value(field, raw_value):
   - Unmatched value -> fallback to original value.
   """
 
-  if raw_value in (None, "", []):
+  if not raw_value and type(raw_value) in EMPTY_TYPES:
     return [] if isinstance(raw_value, list) else ""
   
-  vocab = NORMALIZED_VOCAB.get(field)
-
-  if not vocab:
+  # Most mapping entries are not controlled: skip all string work
+  if field is None or field not in _FIELDS_WITH_VOCAB:
     return raw_value
   
   # Handle list values
+  # (single pass; string items skip the str() cast of normalize_key,
+  # unmatched items fall back to the original value)
   if isinstance(raw_value, list):
-    normalized = []
-    for item in raw_value:
-      key = str(item).strip().lower()
-      entry = vocab.get(key)
-
-      if entry:
-        normalized.append(entry)
-      else:
-        # fallback to original value if not found
-        normalized.append(item)
-    return normalized
+    _get = NORMALIZED_VOCAB_FLAT.get
+    return [
+      _get((field, item.strip().casefold() if type(item) is str else normalize_key(item)))
+      or item
+      for item in raw_value
+    ]
     
   # Handle single / non-list values
-  key = str(raw_value).strip().lower()
+  key = normalize_key(raw_value)
   # entry = string or dict
-  entry = vocab.get(key)
+  entry = NORMALIZED_VOCAB_FLAT.get((field, key))
   return entry if entry else raw_value
@@ -0,0 +1,127 @@
+"""
+Controlled Vocabulary Index
+===========================
+
+This module joins the controlled vocabularies with the codeList registry
+into a single flat lookup table.
+
+Purpose
+-------
+
+Resolving a controlled field normally takes two steps per record:
+  1. raw value -> display text (normalization.py)
+  2. display text -> RI identifier (codelist_registry.py)
+
+Both depend only on static configuration, so they are precomputed once:
+
+  (ic, field, normalized_raw_value) -> (display_text, RI_xxx)
+
+Design
+------
+
+1. Every (`ic`, `controlled`) pair of FIELD_MAPPING is indexed, so a
+   vocabulary used with several ICs gets one set of entries per IC.
+2. Every NORMALIZED_VOCAB entry of that field is resolved against
+   the codelist registry entry of that IC.
+3. Every vocabulary is also indexed with an IC of None and an RI of
+   None (fields without an `ic`, e.g. language, keyword).
+4. The index is built on first lookup (not at import), since it needs
+   the codelist registry.
+5. The RI is only valid for its IC: the builder checks the target
+   node's codeList URL before using it (see xml_builder.set_text).
+
+Public API
+----------
+
+lookup_controlled(field, raw_value, ic=None)
+
+Returns:
+  (display_text, ri_id) or None if the value is not in the vocabulary
+  or the (ic, field) pair is not indexed.
+  ri_id may be None when the field has no codeList or the display text
+  is not found in the registry; the builder then falls back to
+  resolve_codelist_value().
+"""
+
+from .normalization import NORMALIZED_VOCAB, EMPTY_TYPES, normalize_key
+import threading
+from .codelist_registry import get_registry
+from .mapping import FIELD_MAPPING
+
+def _build_index(vocab, registry, mapping):
+  """
+  Build the flat (ic, field, key) -> (display_text, ri_id) table.
+
+  Parameters
+  ----------
+  vocab : dict
+    NORMALIZED_VOCAB structure (keys already folded by normalize_key).
+  registry : dict
+    Codelist registry (see codelist_registry.get_registry).
+  mapping : list
+    FIELD_MAPPING entries, read for their `controlled` / `ic` keys.
+
+  Returns
+  -------
+  dict
+  """
+  pairs = {(None, field) for field in vocab}
+  for entry in mapping:
+    if entry.get("controlled") in vocab and entry.get("ic"):
+      pairs.add((entry["ic"], entry["controlled"]))
+
+  index = {}
+  for ic, field in pairs:
+    value_map = registry.get(ic, {})
+    for key, display in vocab[field].items():
+      ri_id = value_map.get(str(display).split(";")[0].strip())
+      index[(ic, field, key)] = (display, ri_id)
+
+  return index
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+def get_index():
+  """
+  Return the flat controlled index, building it on first call.
+  """
+  global _INDEX
+  if _INDEX is None:
+    with _INDEX_LOCK:
+      if _INDEX is None:
+        _INDEX = _build_index(NORMALIZED_VOCAB, get_registry(), FIELD_MAPPING)
+  return _INDEX
+
+def __getattr__(name):
+  # Lazy module attribute: CONTROLLED_INDEX
+  if name == "CONTROLLED_INDEX":
+    return get_index()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def lookup_controlled(field, raw_value, ic=None):
+  """
+  Resolve a scalar controlled value with a single dictionary probe.
+
+  Parameters
+  ----------
+  field : str or None
+    The mapping `controlled` key.
+  raw_value : str
+    The original value from the source record.
+  ic : str or None
+    The mapping `ic` key; ri_id is only resolved against that IC.
+
+  Returns
+  -------
+  tuple or None
+    (display_text, ri_id) if the value is in the vocabulary,
+    otherwise None (including list values, empty values and
+    (ic, field) pairs absent from FIELD_MAPPING).
+  """
+  if not field or type(raw_value) is list:
+    return None
+  if not raw_value and type(raw_value) in EMPTY_TYPES:
+    return None
+
+  return get_index().get((ic, field, normalize_key(raw_value)))
@@ -26,10 +26,23 @@ This module assumes:
 
 from lxml import etree
 from datetime import datetime
-from .normalization import normalize_controlled_value
+from .normalization import normalize_controlled_value, EMPTY_TYPES
 from .codelist_registry import resolve_codelist_value
+from .vocab_index import lookup_controlled
+from .mapping import FIELD_MAPPING
 import os
-from copy import deepcopy
+from copy import copy, deepcopy
+from functools import lru_cache
+from itertools import chain, repeat
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+import threading
+import logging
+import sys
+
+# Silent unless the application configures logging (see main.py)
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 # Register ISO namespaces
 namespaces = {
@@ -47,17 +60,57 @@ namespaces = {
   "xlink": "http://www.w3.org/1999/xlink",
   "xsi": "http://www.w3.org/2001/XMLSchema-instance"
 }
+namespaces = {prefix: sys.intern(uri) for prefix, uri in namespaces.items()}
 
-def load_base_xml(path):
+# expression -> compiled etree.XPath, shared by all records
+_XPATH_CACHE = {}
+
+def _xp(expr):
+  """
+  Return the compiled etree.XPath for expr, compiling it on first use.
+
+  Compiling once avoids re-parsing the expression and rebinding the
+  namespaces on every tree.xpath(...) call.
+  """
+  compiled = _XPATH_CACHE.get(expr)
+  if compiled is None:
+    compiled = etree.XPath(expr, namespaces=namespaces)
+    _XPATH_CACHE[expr] = compiled
+  return compiled
+
+# Shared template parser. Templates are local trusted files: no ID index
+# (unused here), no entity expansion and no network access.
+_PARSER = etree.XMLParser(
+  remove_blank_text=True,
+  collect_ids=False,
+  resolve_entities=False,
+  no_network=True
+)
+
+@lru_cache(maxsize=8)
+def _parse_base(path):
   """
-  Load and parse the base ISO XML template.
+  Parse a base template once per path.
+
+  The returned tree is shared read-only across records; see
+  load_base_xml. A missing file raises (and is not cached).
   """
   if not os.path.exists(path):
     raise FileNotFoundError(f"Base XML template not founc: {path}")
-  
-  parser = etree.XMLParser(remove_blank_text=True)
-  return etree.parse(path, parser)
 
+  return etree.parse(path, _PARSER)
+
+def load_base_xml(path):
+  """
+  Load the base ISO XML template.
+
+  Each template file is parsed once (see _parse_base); every call
+  returns a fresh deep copy, so callers may modify the returned
+  tree freely.
+  """
+  return etree.ElementTree(deepcopy(_parse_base(path).getroot()))
+
+@lru_cache(maxsize=None)
 def resolve_tag(tag):
   """
   Convert namespace-prefixed tag to fully-qualified QName.
@@ -66,12 +119,21 @@ def resolve_tag(tag):
     -  "gmd:fileIdentifier" -> "{http://www.isotc211.org/2005/gmd}fileIdentifier"
 
   Used for safe XML element lookup and manipulation.
+  Already-resolved (Clark notation) tags are returned unchanged.
+
+  Results are memoized (the tags come from a small fixed set) and
+  interned: the resolved names are kept in module constants and
+  compiled mapping entries and compared against element tags for
+  every record.
   """
-  if ":" not in tag:
+  if ":" not in tag or tag.startswith("{"):
     return tag
   
   prefix, tag = tag.split(":")
-  return f"{{{namespaces[prefix]}}}{tag}"
+  return sys.intern(f"{{{namespaces[prefix]}}}{tag}")
+
+# Attribute removed from every node that receives a value
+_NIL_REASON = resolve_tag("gco:nilReason")
 
 def get_value(record, source, default=None):
   """
@@ -93,24 +155,87 @@ def get_value(record, source, default=None):
   if not source:
     return default
   
+  return _walk(record, compile_steps(source), default)
+
+@lru_cache(maxsize=None)
+def compile_steps(source):
+  """
+  Compile a dot-separated source path into a tuple of steps.
+
+  Example:
+    "files.0.id" -> ("files", 0, "id")
+
+  Numeric parts become int list indexes, so they are converted once
+  instead of on every record.
+  """
+  return tuple(
+    int(part) if part.isdecimal() else part
+    for part in source.split(".")
+  )
+
+# Absent-key marker for _walk
+_MISSING = object()
+
+def _walk(record, steps, default=None):
+  """
+  Walk a record along compiled steps (see compile_steps).
+
+  Any missing key, out-of-range index or type mismatch yields default.
+  Outside a list, an int step is looked up by its string form, so
+  dicts with numeric keys still resolve and strings are never indexed
+  by character.
+
+  Checks are explicit (no exception handling), since a missing
+  optional field is the common case, not an exceptional one. Records
+  are plain decoded JSON, so exact type() checks are enough and a dict
+  step is a single get() against the _MISSING sentinel.
+  """
   value = record
-  parts = source.split(".")
-
-  for part in parts:
-    if isinstance(value, list):
-      try:
-        idx = int(part)
-        value = value[idx]
-      except (ValueError, IndexError):
-        return default
-    else:
-      try:
-        value = value[part]
-      except (KeyError, TypeError):
+
+  for step in steps:
+    if type(step) is int:
+      if type(value) is list:
+        if step < len(value):
+          value = value[step]
+          continue
         return default
+      step = str(step)
+
+    if type(value) is not dict:
+      return default
+    value = value.get(step, _MISSING)
+    if value is _MISSING:
+      return default
 
   return value
 
+# Compiled _walk, when the optional extension is built (see _xml_fast.pyx)
+try:
+  from ._xml_fast import walk as _walk
+except ImportError:
+  pass
+
+def compile_source(source):
+  """
+  Compile a dot-separated source path into an accessor.
+
+  The path is compiled once (see compile_steps); the returned callable
+  behaves like get_value(record, source, default).
+
+  Returns
+  -------
+  callable(record, default=None) or None if source is empty.
+  """
+  if not source:
+    return None
+
+  steps = compile_steps(source)
+
+  def accessor(record, default=None):
+    return _walk(record, steps, default)
+
+  return accessor
+
 def normalize_date(value):
   """
   Normalize ISO datetime string to date-only format.
@@ -127,6 +252,9 @@ def normalize_date(value):
   except Exception:
     return value
 
+# Spatial reference code prefixes: (source form, ISO form)
+_CODE_PREFIXES = (("EPSG-", "EPSG:"), ("SR-ORG-", "SR-ORG:"))
+
 def normalize_code(value):
   """
   Normalize spatial reference codes.
@@ -140,16 +268,20 @@ def normalize_code(value):
   if not value:
     return ""
   try:
-    if value.startswith("EPSG"):
-      return value.replace("EPSG-", "EPSG:")
-    elif value.startswith("SR-ORG"):
-      return value.replace("SR-ORG-", "SR-ORG:")
-    else:
-      return value
+    for old, new in _CODE_PREFIXES:
+      if value.startswith(old):
+        return new + value[len(old):]
+    return value
   except Exception:
     return value
 
-def set_text(lang, tree, xpath, value, secondary_value=None):
+# Both normalizers are pure and see few distinct strings (dates, EPSG
+# codes), so their results are memoized. Only hashable values can be
+# cached; anything else goes through the plain functions.
+_normalize_date = lru_cache(maxsize=1024)(normalize_date)
+_normalize_code = lru_cache(maxsize=1024)(normalize_code)
+
+def set_text(lang, tree, xpath, value, secondary_value=None, resolved_code=None, ic=None):
   """
   Inject scalar value into XML using XPath.
 
@@ -165,134 +297,315 @@ def set_text(lang, tree, xpath, value, secondary_value=None):
   lang : str
     Base language ("en" or "fr")
   tree : etree._ElementTree
-  xpath : str
+  xpath : str or etree.XPath
+    A compiled XPath (see compile_mapping) is evaluated directly.
   value : str
   secondary_value : str (optional)
+  resolved_code : str (optional)
+    Precomputed RI identifier (see vocab_index.py), only used on
+    nodes whose codeList URL ends with "#" + ic. Other nodes are
+    resolved from their own codeList URL.
+  ic : str (optional)
+    The IC resolved_code belongs to.
 
   If codeList resolution fails:
     -> Template value is preserved.
   """
-  if value in (None, "", []):
+  if not value and type(value) in EMPTY_TYPES:
+    return
+
+  if isinstance(xpath, str):
+    compiled = _xp(xpath)
+  else:
+    compiled, xpath = xpath, xpath.path
+
+  # Optional fields often have no node in the template: skip all
+  # normalization work when nothing matches
+  nodes = compiled(tree)
+  if not nodes:
     return
   
   # Normalize date to YYYY-MM-DD format
   if "/gco:Date" in xpath:
-    value = normalize_date(value)
+    value = _normalize_date(value) if isinstance(value, str) else normalize_date(value)
 
   if "/gmd:code" in xpath:
-    value = normalize_code(value)
+    value = _normalize_code(value) if isinstance(value, str) else normalize_code(value)
+
+  ic_suffix = "#" + ic if resolved_code and ic else None
+  secondary_locale = "#fra" if lang == "en" else "#eng"
+  # Coerced once; metadata values are almost always str already
+  text = value if type(value) is str else str(value)
 
-  nodes = tree.xpath(xpath, namespaces=namespaces)
   for node in nodes:
     codeList_url = node.get("codeList")
 
     if codeList_url:
-      resolved_code = resolve_codelist_value(codeList_url, str(value))
+      if ic_suffix and codeList_url.endswith(ic_suffix):
+        code = resolved_code
+      else:
+        code = resolve_codelist_value(codeList_url, text)
 
-      if not resolved_code:
+      if not code:
         # Skip modification completely - keep template default value
-        print(f"[WARN] Codelist value not found for {value}, keeping template fallback.")
+        logger.warning(
+          "Codelist value not found for %s, keeping template fallback.", value
+        )
         # node.attrib.pop("codeList")
         # node.attrib.pop("codeListValue")
         # node.text = str(value)
         continue
 
       # Safe to update
-      node.text = str(value)
-      node.set("codeListValue", resolved_code)
+      node.text = text
+      node.set("codeListValue", code)
 
     else:
-      node.text = str(value)
+      node.text = text
     
+    # Remove nilReason if present (get() first: .attrib builds a proxy
+    # object, which is wasted when there is nothing to remove)
+    parent = node.getparent()
+    if parent.get(_NIL_REASON) is not None:
+      del parent.attrib[_NIL_REASON]
+
+    if secondary_value or type(secondary_value) not in EMPTY_TYPES:
+      _set_secondary(parent, secondary_value, secondary_locale)
+
+# Secondary-language text node of a bilingual (PT_FreeText) field
+_LCS = resolve_tag("gmd:LocalisedCharacterString")
+
+def _set_secondary(parent, secondary_value, secondary_locale):
+  """
+  Fill the first LocalisedCharacterString below parent, if any.
+
+  Shared by scalar and repeated bilingual fields. A plain descendant
+  walk on the resolved tag is cheaper than evaluating an XPath.
+  """
+  fr_node = next(parent.iterdescendants(_LCS), None)
+  if fr_node is not None:
+    fr_node.set("locale", secondary_locale)
+    fr_node.text = (
+      secondary_value if type(secondary_value) is str else str(secondary_value)
+    )
+
+def set_plain_text(lang, tree, xpath, value):
+  """
+  Fast path of set_text for simple fields (see compile_mapping).
+
+  Simple fields have no controlled vocabulary, no secondary language
+  and no date / code normalization, so the value is written as is.
+  If a matched node carries a codeList after all, the field goes
+  through set_text unchanged.
+
+  Parameters
+  ----------
+  lang : str
+  tree : etree._ElementTree
+  xpath : etree.XPath
+  value : str
+  """
+  if not value and type(value) in EMPTY_TYPES:
+    return
+
+  nodes = xpath(tree)
+  for node in nodes:
+    if node.get("codeList"):
+      set_text(lang, tree, xpath, value)
+      return
+
+  text = value if type(value) is str else str(value)
+  for node in nodes:
+    node.text = text
     # Remove nilReason if present
     parent = node.getparent()
-    parent.attrib.pop(resolve_tag("gco:nilReason"), None)
+    if parent.get(_NIL_REASON) is not None:
+      del parent.attrib[_NIL_REASON]
 
-    if secondary_value not in (None, "", []):
-      secondary_locale = "#fra" if lang == "en" else "#eng"
-      fr_nodes = parent.xpath(
-        f".//gmd:LocalisedCharacterString",
-        namespaces=namespaces
-      )
-      if fr_nodes:
-        fr_nodes[0].set("locale", secondary_locale)
-        fr_nodes[0].text = str(secondary_value)
+@lru_cache(maxsize=64)
+def _repeat_slot(base_xml_path, container_xpath, repeat_qname):
+  """
+  Locate the repeat placeholders of a base template once.
 
-def set_repeated_values(lang, tree, container_xpath, repeat_tag, value_xpath, values, secondary_values=None):
+  Returns
+  -------
+  tuple or None
+    (indexes, template, template_bytes): child indexes of the
+    placeholders in the container, the first placeholder (shared,
+    read-only) and its serialized form. None when the template has no
+    such container or placeholder.
+  """
+  containers = container_xpath(_parse_base(base_xml_path))
+  if not containers:
+    return None
+
+  children = list(containers[0])
+  indexes = tuple(
+    i for i, child in enumerate(children) if child.tag == repeat_qname
+  )
+  if not indexes:
+    return None
+
+  template = children[indexes[0]]
+  return indexes, template, etree.tostring(template, with_tail=False)
+
+def _take_placeholders(container, container_xpath, repeat_qname, base_xml_path):
+  """
+  Remove the repeat placeholders from container.
+
+  Uses the placeholder positions precomputed for the base template
+  (see _repeat_slot) when they still match the container, i.e. the
+  container holds exactly that many placeholders, at those positions
+  (an earlier repeat field on the same container changes both);
+  otherwise searches the container.
+
+  Returns
+  -------
+  tuple or None
+    (template, template_bytes, insert_index), or None if there is
+    no placeholder.
+  """
+  slot = None
+  if base_xml_path is not None:
+    slot = _repeat_slot(base_xml_path, container_xpath, repeat_qname)
+
+  if slot is not None:
+    indexes, template, template_bytes = slot
+    if (
+      indexes[-1] < len(container)
+      and sum(1 for _ in container.iterchildren(repeat_qname)) == len(indexes)
+      and all(container[i].tag == repeat_qname for i in indexes)
+    ):
+      for i in reversed(indexes):
+        del container[i]
+      return template, template_bytes, indexes[0]
+
+  # Find existing placeholder(s)
+  existing = container.findall(repeat_qname)
+  if not existing:
+    return None
+
+  # Use first placeholder as template (Element.index avoids building a
+  # list of all children)
+  template = existing[0]
+  insert_index = container.index(template)
+
+  # Remove all placeholders
+  for elem in existing:
+    container.remove(elem)
+
+  return template, etree.tostring(template, with_tail=False), insert_index
+
+def set_repeated_values(lang, tree, container_xpath, repeat_tag, value_xpath, values, secondary_values=None, base_xml_path=None):
   """
   Inject repeated values into XML container.
 
   Process:
     - Locate container element
     - Use first existing child as template
-    - Clone template for each value
+    - Clone template for each value (string values reuse a
+      memoized, pre-filled fragment)
     - Insert values in correct order
     - Handle optional bilingual values
 
   Parameters
   ----------
-  container_xpath : str
+  container_xpath : str or etree.XPath
   repeat_tag : str
-  value_xpath : str
+    Prefixed ("gmd:keyword") or already resolved ("{uri}keyword").
+  value_xpath : str or etree.XPath
+    A compiled value_xpath must be relative to the repeated element
+    (see compile_mapping).
   values : list
   secondary_values : list (optional)
+  base_xml_path : str (optional)
+    Base template the tree was loaded from. The placeholder template
+    and its position are then taken from a per-template cache instead
+    of being searched and serialized on every call.
   """
   if not values:
     return
 
-  containers = tree.xpath(container_xpath, namespaces=namespaces)
+  if not isinstance(container_xpath, etree.XPath):
+    container_xpath = _xp(container_xpath)
+  containers = container_xpath(tree)
   if not containers:
     return
   container = containers[0]
 
   repeat_qname = resolve_tag(repeat_tag)
-  
-  # Find existing placeholder(s)
-  existing = container.findall(repeat_qname)
-  if not existing:
-    return
-
-  # Use first placeholder as template
-  template = existing[0]
-  insert_index = list(container).index(template)
 
-  # Remove all placeholders
-  for elem in existing:
-    container.remove(elem)
+  taken = _take_placeholders(
+    container, container_xpath, repeat_qname, base_xml_path
+  )
+  if taken is None:
+    return
+  template, template_bytes, insert_index = taken
 
-  # Ensure secondary_values alignment
+  # Ensure secondary_values alignment (lazily: a short list is padded
+  # with None, a single value repeats; no per-call list is built)
   if isinstance(secondary_values, list):
-    fr_list = secondary_values
-  elif secondary_values:
-    fr_list = [secondary_values] * len(values)
+    secondaries = chain(secondary_values, repeat(None))
   else:
-    fr_list = [None] * len(values)
-
-  for i, value in enumerate(values):
-    # Clone template
-    new_elem = deepcopy(template)
+    secondaries = repeat(secondary_values or None)
+
+  # Loop invariants: resolved once, not per value
+  secondary_locale = "#fra" if lang == "en" else "#eng"
+  if not isinstance(value_xpath, etree.XPath):
+    value_xpath = _xp(".//" + value_xpath)
+
+  for i, (value, secondary) in enumerate(zip(values, secondaries)):
+    # Clone a cached, already-filled fragment when the values are
+    # hashable strings (controlled lists repeat the same few values);
+    # otherwise clone and fill the template.
+    # copy() on an lxml element is a full C-level subtree clone, without
+    # deepcopy's memo bookkeeping.
+    if type(value) is str and (secondary is None or type(secondary) is str):
+      new_elem = copy(_repeat_fragment(
+        template_bytes, value_xpath, value, secondary, secondary_locale
+      ))
+    else:
+      new_elem = copy(template)
+      _fill_repeated(new_elem, value_xpath, value, secondary, secondary_locale)
 
     # Insert at correct position
     container.insert(insert_index + i, new_elem)
 
-    # Set EN value
-    value_node = new_elem.find(".//" + resolve_tag(value_xpath), namespaces)
-    if value_node is not None:
-      # Remove nilReason if present
-      value_node.getparent().attrib.pop(resolve_tag("gco:nilReason"), None)
-      value_node.text = str(value)
-
-    # Set FR value if present
-    if fr_list and i < len(fr_list) and fr_list[i]:
-      fr_node = new_elem.xpath(
-        ".//gmd:LocalisedCharacterString",
-        namespaces=namespaces
-      )
-      if fr_node:
-        # Update locale
-        secondary_locale = "#fra" if lang == "en" else "#eng"
-        fr_node[0].set("locale", secondary_locale)
-        fr_node[0].text = str(fr_list[i])
+def _fill_repeated(elem, value_xpath, value, secondary_value, secondary_locale):
+  """
+  Fill one cloned repeat element (see set_repeated_values).
+
+  value_xpath must be compiled and relative to elem.
+  """
+  # Set EN value
+  value_node = next(iter(value_xpath(elem)), None)
+  if value_node is not None:
+    # Remove nilReason if present
+    parent = value_node.getparent()
+    if parent.get(_NIL_REASON) is not None:
+      del parent.attrib[_NIL_REASON]
+    value_node.text = value if type(value) is str else str(value)
+
+  # Set FR value if present
+  if secondary_value:
+    _set_secondary(elem, secondary_value, secondary_locale)
+
+@lru_cache(maxsize=2048)
+def _repeat_fragment(template_bytes, value_xpath, value, secondary_value, secondary_locale):
+  """
+  Build (once) a filled repeat element for a given placeholder and value.
+
+  The returned element is shared and must not be modified; callers
+  insert a copy of it.
+  """
+  elem = etree.fromstring(template_bytes)
+  _fill_repeated(elem, value_xpath, value, secondary_value, secondary_locale)
+  return elem
+
+# Tags checked by clean_illegal_placeholders
+_GCO_DATE = resolve_tag("gco:Date")
+_GMD_TC = resolve_tag("gmd:topicCategory")
+_GMD_TC_CODE = resolve_tag("gmd:MD_TopicCategoryCode")
 
 def clean_illegal_placeholders(tree):
   """
@@ -302,21 +615,29 @@ def clean_illegal_placeholders(tree):
     - Empty CI_Date blocks
     - Empty topicCategory elements
 
+  Both are found in a single iter() walk of the tree; removals are
+  collected first, since the tree must not change while iterating.
+
   Ensures final XML passes ISO validation.
   """
-  # Remove empty CI_Date blocks
-  for date in tree.xpath(".//gco:Date", namespaces=namespaces):
-    if not (date.text and date.text.strip()):
-      ci_date = date.getparent().getparent()
-      ci_date.getparent().remove(ci_date)
+  doomed = []
+  for elem in tree.iter(_GCO_DATE, _GMD_TC):
+    if elem.tag == _GCO_DATE:
+      # Remove empty CI_Date blocks
+      if not (elem.text and elem.text.strip()):
+        doomed.append(elem.getparent().getparent())
+    else:
+      # Remove empty topicCategory
+      code = next(elem.iter(_GMD_TC_CODE), None)
+      if code is None or not (code.text and code.text.strip()):
+        doomed.append(elem)
 
-  # Remove empty topicCategory
-  for tc in tree.xpath(".//gmd:topicCategory", namespaces=namespaces):
-    code = tc.find(".//gmd:MD_TopicCategoryCode", namespaces)
-    if code is None or not (code.text and code.text.strip()):
-      tc.getparent().remove(tc)
+  for elem in doomed:
+    parent = elem.getparent()
+    if parent is not None:
+      parent.remove(elem)
 
-def enforce_required_fields(tree, record_id):
+def enforce_required_fields(tree, record_id, now=None):
   """
   Enforce mandatory ISO fields.
 
@@ -324,23 +645,496 @@ def enforce_required_fields(tree, record_id):
     - fileIdentifier
     - dateStamp (current UTC timestamp)
 
+  Parameters
+  ----------
+  now : datetime (optional)
+    Build timestamp; taken per call when omitted. Never computed at
+    import time, so long-running processes stamp each record correctly.
+
   Ensures ISO compliance even if mapping omits them.
+
+  Both are direct children of MD_Metadata, so they are looked up as
+  children of the root first; the document-wide search is only the
+  fallback for templates that nest them elsewhere.
   """
+  root = tree.getroot()
+
   # fileIdentifier
-  fid = tree.xpath(
-    ".//gmd:fileIdentifier/gco:CharacterString",
-    namespaces=namespaces
+  fid = (
+    _xp("gmd:fileIdentifier/gco:CharacterString")(root)
+    or _xp(".//gmd:fileIdentifier/gco:CharacterString")(tree)
   )
   if fid:
     fid[0].text = str(record_id)
 
   # dateStamp
-  ds = tree.xpath(
-    ".//gmd:dateStamp/gco:DateTime",
-    namespaces=namespaces
+  ds = (
+    _xp("gmd:dateStamp/gco:DateTime")(root)
+    or _xp(".//gmd:dateStamp/gco:DateTime")(tree)
   )
   if ds:
-    ds[0].text = datetime.now().isoformat() + "Z"
+    if now is None:
+      now = datetime.now()
+    ds[0].text = now.isoformat() + "Z"
+
+# eq=False: compared and hashed by identity, so compiled mappings can
+# key the _compiled_for cache
+@dataclass(eq=False)
+class CompiledField:
+  """
+  One mapping entry, resolved for the per-record loop (see compile_mapping).
+
+  Attributes
+  ----------
+  source : str or None
+    Original `source` path (kept for reference).
+  controlled : str or None
+    Controlled vocabulary key.
+  ic : str or None
+    `ic` of the entry (codeList item class of its target node).
+  is_repeat : bool
+  is_bilingual : bool
+    True when the entry has a `source_fr`.
+  is_simple : bool
+    Scalar field without `controlled`, `source_fr` or date / code
+    normalization, written with set_plain_text.
+  get_fr : callable or None
+    Accessor for `source_fr`.
+  rest : tuple
+    `source` steps below its root key (see compile_steps).
+  xpath : etree.XPath or None
+  container_xpath : etree.XPath or None
+  value_xpath : etree.XPath or None
+    Relative to the repeated element (".//" + value_xpath).
+  repeat_qname : str or None
+    `repeat_tag` in Clark notation.
+  """
+  __slots__ = (
+    "source", "controlled", "ic", "is_repeat", "is_bilingual", "is_simple",
+    "get_fr", "rest", "xpath", "container_xpath", "value_xpath",
+    "repeat_qname",
+  )
+
+  source: object
+  controlled: object
+  ic: object
+  is_repeat: bool
+  is_bilingual: bool
+  is_simple: bool
+  get_fr: object
+  rest: tuple
+  xpath: object
+  container_xpath: object
+  value_xpath: object
+  repeat_qname: object
+
+def _compile_field(field):
+  """
+  Resolve one FIELD_MAPPING entry into a CompiledField.
+
+  Returns
+  -------
+  (root, CompiledField)
+    root is a 1-tuple with the root step of `source`, or ().
+  """
+  xpath = field.get("xpath")
+  steps = compile_steps(field["source"]) if field.get("source") else ()
+
+  compiled = CompiledField(
+    source=field.get("source"),
+    controlled=field.get("controlled"),
+    ic=field.get("ic"),
+    is_repeat=bool(field.get("repeat")),
+    is_bilingual=bool(field.get("source_fr")),
+    is_simple=bool(
+      xpath
+      and not field.get("repeat")
+      and not field.get("controlled")
+      and not field.get("source_fr")
+      and "/gco:Date" not in xpath
+      and "/gmd:code" not in xpath
+    ),
+    get_fr=compile_source(field.get("source_fr")),
+    rest=steps[1:],
+    xpath=_xp(xpath) if xpath else None,
+    container_xpath=(
+      _xp(field["container_xpath"]) if field.get("container_xpath") else None
+    ),
+    value_xpath=(
+      _xp(".//" + field["value_xpath"]) if field.get("value_xpath") else None
+    ),
+    repeat_qname=(
+      resolve_tag(field["repeat_tag"]) if field.get("repeat_tag") else None
+    ),
+  )
+  return steps[:1], compiled
+
+def compile_mapping(mapping):
+  """
+  Precompile mapping entries for the per-record loop.
+
+  Every entry is resolved once into a CompiledField: tags in Clark
+  notation, XPaths compiled (from the shared _xp cache), source paths
+  split into steps and flags such as is_repeat / is_bilingual decided.
+
+  Consecutive entries with the same root key of their `source` path
+  (e.g. a run of "edhProfile.*" entries) are grouped, so the builder
+  resolves that root once per run. Entries are never reordered: the
+  mapping order is the order fields are written in, which decides
+  which entry wins when two target the same node, and where repeated
+  fields change the tree structure.
+
+  Returns
+  -------
+  list of (root, [CompiledField])
+    root is a 1-tuple with the root step, or () for entries without
+    a source. The same root may appear in several runs.
+
+  The input mapping is left unchanged.
+  """
+  groups = []
+  for field in mapping:
+    root, compiled = _compile_field(field)
+    if groups and groups[-1][0] == root:
+      groups[-1][1].append(compiled)
+    else:
+      groups.append((root, [compiled]))
+
+  return groups
+
+def _is_compiled(mapping):
+  # Compiled mappings are lists of (root, fields) tuples; raw mappings
+  # are lists of dicts.
+  return bool(mapping) and isinstance(mapping[0], tuple)
+
+class _PinnedXPath:
+  """
+  Stand-in for an etree.XPath that returns, by child-index paths, the
+  nodes the expression matched in a pristine base template.
+
+  Valid only on a fresh copy of that template (see load_base_xml)
+  before any element is inserted or removed; build_record uses it for
+  the scalar fields emitted before the first repeated field. Only
+  predicate-free expressions are pinned (see _pin).
+  """
+  __slots__ = ("path", "index_paths")
+
+  def __init__(self, path, index_paths):
+    self.path = path
+    self.index_paths = index_paths
+
+  def __call__(self, tree):
+    root = tree.getroot()
+    nodes = []
+    for index_path in self.index_paths:
+      node = root
+      for i in index_path:
+        node = node[i]
+      nodes.append(node)
+    return nodes
+
+@lru_cache(maxsize=512)
+def _pin(base_xml_path, xpath):
+  """
+  Return a _PinnedXPath for xpath on the given base template.
+
+  Falls back to xpath itself when the expression has a predicate
+  (earlier fields may rewrite the text or attributes it tests, e.g.
+  a codeListValue) or when a match is not an element.
+  """
+  if "[" in xpath.path:
+    return xpath
+
+  index_paths = []
+  for node in xpath(_parse_base(base_xml_path)):
+    if not isinstance(node, etree._Element):
+      return xpath
+
+    index_path = []
+    parent = node.getparent()
+    while parent is not None:
+      index_path.append(parent.index(node))
+      node, parent = parent, parent.getparent()
+    index_paths.append(tuple(reversed(index_path)))
+
+  return _PinnedXPath(xpath.path, tuple(index_paths))
+
+def _emit_build_record(compiled, lang):
+  """
+  Generate a build_record(tree, record, lang, base_xml_path) function
+  for a compiled mapping (see compile_mapping) and a base language.
+
+  The per-field loop of build_xml is unrolled into straight-line
+  Python source: every field becomes one block, with its static
+  properties (repeat, controlled, source_fr, ...) decided here, once,
+  instead of on every record. Which source is primary and which is
+  secondary is also fixed here, since one function is generated per
+  language. Per-field objects (compiled XPaths, accessors, source
+  steps) are bound as globals of the generated code.
+
+  Until the first repeated field, the tree is still an unmodified copy
+  of its template, so scalar targets are reached by precomputed child
+  indexes (see _pin); later scalar fields evaluate their compiled XPath.
+
+  Returns
+  -------
+  callable(tree, record, lang, base_xml_path)
+  """
+  env = {
+    "_walk": _walk,
+    "lookup_controlled": lookup_controlled,
+    "normalize_controlled_value": normalize_controlled_value,
+    "set_text": set_text,
+    "set_plain_text": set_plain_text,
+    "set_repeated_values": set_repeated_values,
+    "_pin": _pin,
+  }
+  lines = [
+    "def build_record(tree, record, lang, base_xml_path):",
+  ]
+
+  # Set once a repeated field (which inserts / removes elements) is emitted
+  structure_changed = False
+
+  def target(n):
+    if structure_changed:
+      return f"_xpath{n}"
+    return f"_pin(base_xml_path, _xpath{n})"
+
+  n = 0
+  for g, (root, fields) in enumerate(compiled):
+    if root:
+      env[f"_root{g}"] = root
+      lines.append(f"  sub = _walk(record, _root{g})")
+
+    for field in fields:
+      controlled = repr(field.controlled)
+      ic = repr(field.ic)
+      has_fr = field.is_bilingual
+
+      # Primary / secondary value selection (see build_xml)
+      if root:
+        env[f"_rest{n}"] = field.rest
+        source = f"_walk(sub, _rest{n})"
+      else:
+        source = "None"
+
+      lines.append(f"  # {field.source!r}")
+      if has_fr:
+        env[f"_get_fr{n}"] = field.get_fr
+        if lang == "fr":
+          lines += [
+            f"  secondary_value = {source}",
+            f"  primary_value = _get_fr{n}(record)",
+          ]
+        else:
+          lines += [
+            f"  primary_value = {source}",
+            f"  secondary_value = _get_fr{n}(record)",
+          ]
+      else:
+        lines += [
+          f"  primary_value = {source}",
+          "  secondary_value = None",
+        ]
+
+      # Simple scalar: no vocabulary lookup, written as is
+      if field.is_simple:
+        env[f"_xpath{n}"] = field.xpath
+        lines.append(
+          f"  set_plain_text(lang, tree, {target(n)}, primary_value)"
+        )
+
+      # Scalar type
+      elif not field.is_repeat:
+        env[f"_xpath{n}"] = field.xpath
+        lines += [
+          "  resolved_code = None",
+          f"  indexed = lookup_controlled({controlled}, primary_value, {ic})",
+          "  if indexed:",
+          "    value, resolved_code = indexed",
+          "  else:",
+          f"    value = normalize_controlled_value({controlled}, primary_value)",
+        ]
+        if has_fr:
+          lines.append(
+            f"  secondary_value = normalize_controlled_value({controlled}, secondary_value)"
+          )
+        lines.append(
+          f"  set_text(lang, tree, {target(n)}, value, secondary_value, resolved_code, {ic})"
+        )
+
+      # Repeat type
+      elif field.container_xpath is None:
+        lines.append("  raise ValueError('Repeat requires container_xpath')")
+
+      else:
+        env[f"_container_xpath{n}"] = field.container_xpath
+        env[f"_repeat_qname{n}"] = field.repeat_qname
+        env[f"_value_xpath{n}"] = field.value_xpath
+        lines += [
+          f"  values = normalize_controlled_value({controlled}, primary_value)",
+          "  secondary_values = None",
+        ]
+        if has_fr:
+          lines.append(
+            f"  secondary_values = normalize_controlled_value({controlled}, secondary_value)"
+          )
+        lines.append(
+          f"  set_repeated_values(lang, tree, _container_xpath{n}, "
+          f"_repeat_qname{n}, _value_xpath{n}, values, secondary_values, "
+          "base_xml_path)"
+        )
+        structure_changed = True
+
+      n += 1
+
+  exec(compile("\n".join(lines) + "\n", "<build_record>", "exec"), env)
+  return env["build_record"]
+
+# Base languages a build_record function is generated for
+LANGUAGES = ("en", "fr")
+
+def _build_entry(mapping):
+  """
+  Compile mapping and generate its build functions.
+
+  Returns (compiled mapping, {lang: build_record}, specialized build).
+  """
+  compiled = mapping if _is_compiled(mapping) else compile_mapping(mapping)
+  build_records = {
+    lang: _emit_build_record(compiled, lang) for lang in LANGUAGES
+  }
+  return compiled, build_records, specialize(build_records)
+
+def _fingerprint(mapping):
+  """
+  Return a hashable snapshot of mapping's content.
+
+  Raw mappings are fingerprinted by their entries' items, so a mapping
+  edited in place gets a new key, and equal mappings share one.
+  Compiled mappings are fingerprinted by their CompiledField objects
+  (hashed by identity).
+  """
+  if _is_compiled(mapping):
+    return True, tuple((root, tuple(fields)) for root, fields in mapping)
+  return False, tuple(tuple(field.items()) for field in mapping)
+
+@lru_cache(maxsize=16)
+def _compiled_for(fingerprint):
+  """
+  _build_entry for a mapping rebuilt from its fingerprint (memoized).
+  """
+  is_compiled, entries = fingerprint
+  if is_compiled:
+    mapping = [(root, list(fields)) for root, fields in entries]
+  else:
+    mapping = [dict(items) for items in entries]
+  return _build_entry(mapping)
+
+def _compiled_entry(mapping):
+  """
+  Return (compiled mapping, {lang: build_record}, specialized build)
+  for mapping, keyed on its content (see _fingerprint).
+
+  Mappings with unhashable values are compiled on every call.
+  """
+  fingerprint = _fingerprint(mapping)
+  try:
+    hash(fingerprint)
+  except TypeError:
+    return _build_entry(mapping)
+  return _compiled_for(fingerprint)
+
+def _get_compiled(mapping):
+  """
+  Return the compiled form of mapping, compiling it on first use.
+  """
+  return _compiled_entry(mapping)[0]
+
+def _get_build_record(mapping, lang):
+  """
+  Return the generated build_record function of mapping for lang.
+  """
+  return _compiled_entry(mapping)[1][lang]
+
+def _get_builder(mapping):
+  """
+  Return the specialized build(record, record_id) function of mapping.
+  """
+  return _compiled_entry(mapping)[2]
+
+# Source paths that select the base template
+_SPATIAL_STEPS = compile_steps("spatialType")
+_LANGUAGE_STEPS = compile_steps("edhProfile.language")
+
+def specialize(build_records):
+  """
+  Bind a mapping's generated build_record functions into a complete
+  build(record, record_id) function.
+
+  Template selection is resolved up front: source paths are compiled
+  and the four template paths are built once, so per record only the
+  language and spatial type are read.
+
+  Parameters
+  ----------
+  build_records : dict
+    {lang: build_record} (see _emit_build_record).
+
+  Returns
+  -------
+  callable(record, record_id) -> etree._ElementTree
+  """
+  templates = {
+    (lang, is_spatial): f"src/xml/base_{lang}{'_spatial' if is_spatial else ''}.xml"
+    for lang in LANGUAGES
+    for is_spatial in (False, True)
+  }
+
+  def build(record, record_id):
+    is_spatial = bool(_walk(record, _SPATIAL_STEPS))
+    lang = str(_walk(record, _LANGUAGE_STEPS, "en")).strip().lower()
+    lang = "fr" if lang.startswith("fr") else "en"
+
+    return _build_from_template(
+      record,
+      record_id,
+      build_records[lang],
+      lang,
+      is_spatial,
+      templates[(lang, is_spatial)]
+    )
+
+  return build
+
+def _build_from_template(record, record_id, build_record, lang, is_spatial, base_xml_path):
+  """
+  Shared tail of build_xml: load the template, run build_record,
+  clean placeholders and enforce required fields.
+  """
+  # One timestamp per record, shared by every generated date field
+  now = datetime.now()
+
+  record_type = "Spatial" if is_spatial else "Non-spatial"
+  logger.debug("Record %s", record_id)
+  logger.debug(
+    "%s %s record. Load template from %s",
+    record_type, lang.upper(), base_xml_path
+  )
+
+  tree = load_base_xml(base_xml_path)
+
+  build_record(tree, record, lang, base_xml_path)
+
+  clean_illegal_placeholders(tree)
+  enforce_required_fields(tree, record_id, now)
+
+  return tree
+
+# Default mapping, compiled (and its build functions generated) once
+# at import
+COMPILED_MAPPING = _get_compiled(FIELD_MAPPING)
 
 def build_xml(record, record_id, mapping, base_xml_path=None):
   """
@@ -351,105 +1145,169 @@ def build_xml(record, record_id, mapping, base_xml_path=None):
   record : dict
   record_id : str
   mapping : list
+    FIELD_MAPPING-style entries, or the output of compile_mapping.
+    Either way it is compiled once per mapping object.
   base_xml_path : str (optional)
 
   Process
   -------
   1. Determine language and spatial type
   2. Load appropriate base template
-  3. Iterate through mapping configuration
+  3. Run the generated build_record function of the mapping
+     (generated once per mapping object, see _emit_build_record)
   4. Inject scalar or repeated values
   5. Clean invalid placeholders
   6. Enforce required ISO fields
 
+  Without base_xml_path, the whole process runs in the mapping's
+  specialized build function (see specialize).
+
   Returns
   -------
   etree._ElementTree
     Fully constructed ISO-compliant XML tree.
   """
-  # Determine spatial
+  if base_xml_path is None:
+    return _get_builder(mapping)(record, record_id)
+
   is_spatial = bool(get_value(record, "spatialType"))
+  lang = "fr" if "fr" in base_xml_path.lower() else "en"
+
+  return _build_from_template(
+    record,
+    record_id,
+    _get_build_record(mapping, lang),
+    lang,
+    is_spatial,
+    base_xml_path
+  )
 
-  # Determine base language
-  if base_xml_path is None:
-    lang = get_value(record, "edhProfile.language", default="en")
-    lang = str(lang).strip().lower()
-    lang = "fr" if lang.startswith("fr") else "en"
-    base_xml_suffix = "_spatial" if is_spatial else ""
-    base_xml_path = f"src/xml/base_{lang}{base_xml_suffix}.xml"
-  else:
-    lang = "fr" if "fr" in base_xml_path.lower() else "en"
+def build_xml_to_bytes(record, record_id, mapping, base_xml_path=None, pretty_print=True):
+  """
+  Build a record and serialize it in one call.
 
-  record_type = "Spatial" if is_spatial else "Non-spatial"
-  print(f"[INFO] Record {str(record_id)}")
-  print(f"[INFO] {record_type} {lang.upper()} record. Load template from {base_xml_path}")
+  Parameters
+  ----------
+  record, record_id, mapping, base_xml_path :
+    See build_xml.
+  pretty_print : bool
+    Indent the output (the harvester's file format). Pass False for
+    the fastest serialization.
 
-  tree = load_base_xml(base_xml_path)
+  Returns
+  -------
+  bytes
+    UTF-8 encoded document with XML declaration.
+  """
+  tree = build_xml(record, record_id, mapping, base_xml_path)
+  return etree.tostring(
+    tree,
+    pretty_print=pretty_print,
+    xml_declaration=True,
+    encoding="UTF-8"
+  )
 
-  for field in mapping:
-    is_repeat = field.get("repeat")
+# Template variants (language x spatial), preloaded by build_many workers
+BASE_TEMPLATES = tuple(
+  f"src/xml/base_{lang}{suffix}.xml"
+  for lang in ("en", "fr")
+  for suffix in ("", "_spatial")
+)
 
-    if lang == "fr":
-      if field.get("source_fr"):
-        primary_source = field.get("source_fr")
-        secondary_source = field.get("source")
-      else:
-        primary_source = field.get("source")
-        secondary_source = None
-    else:
-      primary_source = field.get("source")
-      secondary_source = field.get("source_fr")
-
-    # Scalar type
-    if not is_repeat:
-      value = get_value(record, primary_source)
-      value = normalize_controlled_value(
-        field.get("controlled"), value
-      )
-
-      secondary_value = None
-      if secondary_source:
-        secondary_value = get_value(record, secondary_source)
-        secondary_value = normalize_controlled_value(
-          field.get("controlled"), secondary_value
-        )
+def _preload_base_templates():
+  """
+  Parse every available base template variant into the _parse_base cache.
+  """
+  for path in BASE_TEMPLATES:
+    if os.path.exists(path):
+      _parse_base(path)
 
-      set_text(
-        lang,
-        tree,
-        field["xpath"],
-        value,
-        secondary_value
-      )
+# Thread started by start_template_preload, if any
+_PRELOAD_THREAD = None
 
-    # Repeat type
-    else:
-      if "container_xpath" not in field:
-        raise ValueError("Repeat requires container_xpath")
-      
-      raw_value = get_value(record, primary_source)
-      values = normalize_controlled_value(
-        field.get("controlled"), raw_value
-      )
-
-      secondary_values = None
-      if secondary_source:
-        raw_secondary_values = get_value(record, secondary_source)
-        secondary_values = normalize_controlled_value(
-          field.get("controlled"), raw_secondary_values
-        )
+def start_template_preload():
+  """
+  Parse every base template in a background daemon thread.
 
-      set_repeated_values(
-        lang,
-        tree,
-        field["container_xpath"],
-        field["repeat_tag"],
-        field["value_xpath"],
-        values,
-        secondary_values
-      )
+  Lets a caller warm the template cache while it does other work (e.g.
+  the harvester while it waits for the API), so the first record does
+  not pay for parsing. Nothing is started at import: a process must
+  not fork while this thread may be inside the parser, and build_many
+  joins it before creating its workers.
 
-  clean_illegal_placeholders(tree)
-  enforce_required_fields(tree, record_id)
+  Returns
+  -------
+  threading.Thread
+  """
+  global _PRELOAD_THREAD
+  _PRELOAD_THREAD = threading.Thread(
+    target=_preload_base_templates,
+    name="preload-base-templates",
+    daemon=True
+  )
+  _PRELOAD_THREAD.start()
+  return _PRELOAD_THREAD
 
-  return tree
+# Mapping used by the current build_many worker (see _preload_template)
+_WORKER_MAPPING = None
+
+def _preload_template(mapping):
+  """
+  build_many worker initializer.
+
+  Parses every base template and compiles the mapping (including its
+  generated build functions) once per worker process, so none of it
+  is re-sent, re-parsed or re-compiled for each record.
+  """
+  global _WORKER_MAPPING
+  _WORKER_MAPPING = mapping
+
+  _compiled_entry(mapping)
+  _preload_base_templates()
+
+def _build_one(item):
+  """
+  Build and serialize one (record, record_id) pair in a worker.
+
+  Bytes are returned instead of the tree: they are much cheaper to
+  send back to the parent process.
+  """
+  record, record_id = item
+  return build_xml_to_bytes(record, record_id, _WORKER_MAPPING)
+
+def build_many(records, mapping, workers=None, chunksize=32):
+  """
+  Build many records in parallel worker processes.
+
+  Records are independent and the build is CPU-bound in lxml, so
+  processes scale with the number of cores.
+
+  Parameters
+  ----------
+  records : iterable of (dict, str)
+    (record, record_id) pairs.
+  mapping : list
+  workers : int (optional)
+    Number of processes (default: os.cpu_count()).
+  chunksize : int
+    Records sent to a worker per round trip.
+
+  Returns
+  -------
+  list of bytes
+    Serialized XML documents, in input order.
+  """
+  # Compile in the parent first: mapping errors surface before any
+  # worker starts, and forked workers inherit the compiled form.
+  _compiled_entry(mapping)
+
+  # Never fork while the preload thread may be inside the parser
+  if _PRELOAD_THREAD is not None:
+    _PRELOAD_THREAD.join()
+
+  with ProcessPoolExecutor(
+    max_workers=workers,
+    initializer=_preload_template,
+    initargs=(mapping,)
+  ) as executor:
+    return list(executor.map(_build_one, records, chunksize=chunksize))
@@ -0,0 +1,97 @@
+import unittest
+
+from src.xml_builder import build_xml, namespaces
+
+CITATION_XPATH = (
+  ".//gmd:identificationInfo/gmd:MD_DataIdentification"
+  "/gmd:citation/gmd:CI_Citation"
+)
+
+KEYWORDS_XPATH = (
+  ".//gmd:identificationInfo/gmd:MD_DataIdentification"
+  "/gmd:descriptiveKeywords/gmd:MD_Keywords"
+)
+
+def _keyword_field(source):
+  return {
+    "repeat": True,
+    "container_xpath": KEYWORDS_XPATH,
+    "repeat_tag": "gmd:keyword",
+    "value_xpath": "gco:CharacterString",
+    "source": source
+  }
+
+class RepeatedValuesTest(unittest.TestCase):
+
+  def test_second_repeat_field_on_same_container_replaces_first(self):
+    # The first field leaves three keywords where the template had its
+    # placeholders; the second must replace all of them, not only those
+    # at the template's placeholder positions.
+    mapping = [_keyword_field("a"), _keyword_field("b")]
+    record = {"a": ["1", "2", "3"], "b": ["x"]}
+
+    tree = build_xml(record, "test-record", mapping)
+
+    keywords = tree.xpath(
+      KEYWORDS_XPATH + "/gmd:keyword/gco:CharacterString/text()",
+      namespaces=namespaces
+    )
+    self.assertEqual(keywords, ["x"])
+
+class ScalarValuesTest(unittest.TestCase):
+
+  def test_predicate_sees_values_written_by_earlier_fields(self):
+    # The first field turns the first date into a revision date (RI_368);
+    # the publication date (RI_367) must not then be written into it.
+    mapping = [
+      {
+        "xpath": CITATION_XPATH + "/gmd:date[1]/gmd:CI_Date/gmd:dateType/gmd:CI_DateTypeCode",
+        "source": "dateType"
+      },
+      {
+        "xpath": CITATION_XPATH + "/gmd:date/gmd:CI_Date[gmd:dateType/gmd:CI_DateTypeCode[@codeListValue='RI_367']]/gmd:date/gco:Date",
+        "source": "published"
+      },
+    ]
+    record = {"dateType": "revision; révision", "published": "2024-05-01"}
+
+    tree = build_xml(record, "test-record", mapping)
+
+    dates = [
+      (
+        tuple(date.xpath("gmd:dateType/*/@codeListValue", namespaces=namespaces)),
+        tuple(date.xpath("gmd:date/gco:Date/text()", namespaces=namespaces)),
+      )
+      for date in tree.xpath(CITATION_XPATH + "/gmd:date/gmd:CI_Date", namespaces=namespaces)
+    ]
+    self.assertNotIn((("RI_368",), ("2024-05-01",)), dates)
+
+  def test_last_entry_on_a_node_wins_in_mapping_order(self):
+    # "a.x" and "a.y" share a source root but must not be batched
+    # ahead of "b"
+    title_xpath = CITATION_XPATH + "/gmd:title/gco:CharacterString"
+    mapping = [
+      {"xpath": title_xpath, "source": source}
+      for source in ("a.x", "b", "a.y")
+    ]
+    record = {"a": {"x": "first", "y": "third"}, "b": "second"}
+
+    tree = build_xml(record, "test-record", mapping)
+
+    titles = tree.xpath(title_xpath + "/text()", namespaces=namespaces)
+    self.assertEqual(titles, ["third"])
+
+  def test_mapping_edited_in_place_is_recompiled(self):
+    title_xpath = CITATION_XPATH + "/gmd:title/gco:CharacterString"
+    mapping = [{"xpath": title_xpath, "source": "a"}]
+    record = {"a": "first", "b": "second"}
+
+    build_xml(record, "test-record", mapping)
+    mapping[0]["source"] = "b"
+    tree = build_xml(record, "test-record", mapping)
+
+    titles = tree.xpath(title_xpath + "/text()", namespaces=namespaces)
+    self.assertEqual(titles, ["second"])
+
+if __name__ == "__main__":
+  unittest.main()